@@ -0,0 +1,18 @@
+-- Users lookup by id array (dashboard)
+-- Run this in Supabase SQL Editor
+
+-- ============================================
+-- Function: select_users_by_ids
+-- 配列バインドでユーザーを一括取得（IN リストのチャンク分割を不要にする）
+-- ============================================
+CREATE OR REPLACE FUNCTION select_users_by_ids(ids BIGINT[])
+RETURNS TABLE (
+    user_id BIGINT,
+    username VARCHAR(255),
+    current_score DECIMAL(10, 2),
+    weekly_score DECIMAL(10, 2)
+) AS $$
+    SELECT u.user_id, u.username, u.current_score, u.weekly_score
+    FROM users u
+    WHERE u.user_id = ANY(ids);
+$$ LANGUAGE sql STABLE;
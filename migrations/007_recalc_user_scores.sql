@@ -0,0 +1,37 @@
+-- User score recalculation aggregate (tools/recalc_scores.py)
+-- Run this in Supabase SQL Editor
+
+-- ============================================
+-- Function: recalc_user_scores
+-- 全ユーザーの累計スコア・週間スコアをサーバー側で一括集計
+-- total_score が 0 のメッセージは base_score * nlp_score_multiplier で補完する
+-- ============================================
+CREATE OR REPLACE FUNCTION recalc_user_scores(week_ago TIMESTAMP WITH TIME ZONE)
+RETURNS TABLE (
+    user_id BIGINT,
+    username VARCHAR(255),
+    total NUMERIC,
+    weekly NUMERIC
+) AS $$
+    WITH scored AS (
+        SELECT
+            m.user_id,
+            m.created_at,
+            CASE
+                WHEN COALESCE(m.total_score, 0) = 0
+                     AND COALESCE(m.base_score, 0) * COALESCE(m.nlp_score_multiplier, 1.0) > 0
+                THEN m.base_score * COALESCE(m.nlp_score_multiplier, 1.0)
+                ELSE COALESCE(m.total_score, 0)
+            END AS score
+        FROM messages m
+    )
+    SELECT
+        u.user_id,
+        u.username,
+        COALESCE(SUM(s.score), 0) AS total,
+        COALESCE(SUM(s.score) FILTER (WHERE s.created_at >= week_ago), 0) AS weekly
+    FROM users u
+    LEFT JOIN scored s ON s.user_id = u.user_id
+    GROUP BY u.user_id, u.username
+    ORDER BY u.user_id;
+$$ LANGUAGE sql STABLE;
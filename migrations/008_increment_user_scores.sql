@@ -0,0 +1,23 @@
+-- User score increments in bulk (tools/import_history.py)
+-- Run this in Supabase SQL Editor
+
+-- ============================================
+-- Function: increment_user_scores
+-- [{"user_id": ..., "delta": ...}, ...] を受け取り、累計・週間スコアへ一括加算
+-- SELECT → UPDATE の往復をなくし、同時実行時の加算漏れも防ぐ
+-- ============================================
+CREATE OR REPLACE FUNCTION increment_user_scores(deltas JSONB)
+RETURNS void AS $$
+BEGIN
+    UPDATE users u
+    SET current_score = COALESCE(u.current_score, 0) + d.delta,
+        weekly_score = COALESCE(u.weekly_score, 0) + d.delta,
+        updated_at = NOW()
+    FROM (
+        SELECT (e->>'user_id')::BIGINT AS user_id, SUM((e->>'delta')::DECIMAL(10, 2)) AS delta
+        FROM jsonb_array_elements(deltas) e
+        GROUP BY 1
+    ) d
+    WHERE u.user_id = d.user_id;
+END;
+$$ LANGUAGE plpgsql;
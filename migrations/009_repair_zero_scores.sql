@@ -0,0 +1,43 @@
+-- One-off total_score repair + simplified recalc aggregate (tools/recalc_scores.py)
+-- Run this in Supabase SQL Editor
+
+-- ============================================
+-- Function: repair_zero_scores
+-- total_score が 0 のまま保存されたメッセージ（過去インポートの欠損）を
+-- base_score * nlp_score_multiplier で一括修復し、修復件数を返す
+-- ============================================
+CREATE OR REPLACE FUNCTION repair_zero_scores()
+RETURNS INTEGER AS $$
+DECLARE
+    repaired INTEGER;
+BEGIN
+    UPDATE messages
+    SET total_score = base_score * COALESCE(nlp_score_multiplier, 1.0)
+    WHERE COALESCE(total_score, 0) = 0
+      AND COALESCE(base_score, 0) * COALESCE(nlp_score_multiplier, 1.0) > 0;
+    GET DIAGNOSTICS repaired = ROW_COUNT;
+    RETURN repaired;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- Function: recalc_user_scores (replaces 007)
+-- 修復は repair_zero_scores が DB 側で行うため、total_score をそのまま集計する
+-- ============================================
+CREATE OR REPLACE FUNCTION recalc_user_scores(week_ago TIMESTAMP WITH TIME ZONE)
+RETURNS TABLE (
+    user_id BIGINT,
+    username VARCHAR(255),
+    total NUMERIC,
+    weekly NUMERIC
+) AS $$
+    SELECT
+        u.user_id,
+        u.username,
+        COALESCE(SUM(m.total_score), 0) AS total,
+        COALESCE(SUM(m.total_score) FILTER (WHERE m.created_at >= week_ago), 0) AS weekly
+    FROM users u
+    LEFT JOIN messages m ON m.user_id = u.user_id
+    GROUP BY u.user_id, u.username
+    ORDER BY u.user_id;
+$$ LANGUAGE sql STABLE;
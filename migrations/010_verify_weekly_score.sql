@@ -0,0 +1,34 @@
+-- Weekly score aggregate per user (restore_weekly_scores.py)
+-- Run this in Supabase SQL Editor
+
+-- ============================================
+-- Function: verify_weekly_score
+-- since 以降のメッセージスコア (base_score * nlp_score_multiplier) と、
+-- 自分のメッセージが since 以降に受けたリアクション（自己リアクション除く）をサーバー側で集計
+-- ============================================
+CREATE OR REPLACE FUNCTION verify_weekly_score(uid BIGINT, since TIMESTAMP WITH TIME ZONE)
+RETURNS TABLE (
+    msg_count INTEGER,
+    msg_score NUMERIC,
+    reaction_count INTEGER,
+    reaction_score NUMERIC
+) AS $$
+    WITH msg AS (
+        SELECT COUNT(*)::INTEGER AS msg_count,
+               COALESCE(SUM(m.base_score * m.nlp_score_multiplier), 0) AS msg_score
+        FROM messages m
+        WHERE m.user_id = uid
+          AND m.created_at >= since
+    ),
+    rx AS (
+        SELECT COUNT(*)::INTEGER AS reaction_count,
+               COALESCE(SUM(r.weight), 0) AS reaction_score
+        FROM reactions r
+        JOIN messages m ON m.message_id = r.message_id
+        WHERE m.user_id = uid
+          AND r.user_id <> uid
+          AND r.created_at >= since
+    )
+    SELECT msg.msg_count, msg.msg_score, rx.reaction_count, rx.reaction_score
+    FROM msg, rx;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,19 @@
+-- Covering indexes for weekly score aggregation (verify_weekly_score / restore_weekly_scores.py)
+-- Run this in Supabase SQL Editor
+-- CREATE INDEX CONCURRENTLY はトランザクション内で実行できないため、各文を1つずつ実行すること
+
+-- ============================================
+-- Index: idx_messages_user_created
+-- messages WHERE user_id = ? AND created_at >= ? をインデックスのみで処理
+-- ============================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_messages_user_created
+    ON messages(user_id, created_at DESC)
+    INCLUDE (base_score, nlp_score_multiplier, message_id);
+
+-- ============================================
+-- Index: idx_reactions_message_created
+-- reactions WHERE message_id IN (...) AND created_at >= ? AND user_id <> ? をインデックスのみで処理
+-- ============================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reactions_message_created
+    ON reactions(message_id, created_at DESC)
+    INCLUDE (user_id, weight);
@@ -1,31 +1,120 @@
 
 import asyncio
+import math
 import os
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from dotenv import load_dotenv
 from supabase import create_client
 
 load_dotenv()
 
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_KEY")
+@lru_cache(maxsize=1)
+def get_client():
+    """Supabase client, created on first use rather than at import time."""
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
 
-if not url or not key:
-    print("Error: SUPABASE_URL or SUPABASE_KEY not set")
-    exit(1)
+    if not url or not key:
+        print("Error: SUPABASE_URL or SUPABASE_KEY not set")
+        exit(1)
 
-client = create_client(url, key)
+    return create_client(url, key)
 
-# Start of Week (Monday 00:00 JST = Sunday 15:00 UTC)
-START_TIME_UTC = "2026-01-18T15:00:00+00:00"
+JST = timezone(timedelta(hours=9))
+
+def current_week_start_utc():
+    """Start of the current week (Monday 00:00 JST = Sunday 15:00 UTC) as an ISO timestamp."""
+    now_jst = datetime.now(JST)
+    monday = (now_jst - timedelta(days=now_jst.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    return monday.astimezone(timezone.utc).isoformat()
+
+# Start of Week, computed once per run so the script is correct every week
+START_TIME_UTC = current_week_start_utc()
+
+# Message IDs per reactions query (keeps the in.(...) filter well under URL length limits)
+IN_CHUNK_SIZE = 500
+# Rows per page (PostgREST caps a single response at max-rows, 1000 by default)
+PAGE_SIZE = 1000
+
+# Set once verify_weekly_score (migrations/010) turns out not to be installed.
+_rpc_missing = False
+
+def is_missing_function_error(e):
+    """True when PostgREST/Postgres reports the RPC itself as unknown (not a transient failure)."""
+    return str(getattr(e, "code", "") or "") in ("PGRST202", "42883")
+
+def iter_pages(build_query):
+    """Yield result pages of build_query() one range at a time, so memory stays bounded by PAGE_SIZE."""
+    offset = 0
+    while True:
+        rows = build_query().range(offset, offset + PAGE_SIZE - 1).execute().data or []
+        if rows:
+            yield rows
+        if len(rows) < PAGE_SIZE:
+            return
+        offset += len(rows)
+
+def calc_message_score_client(user_id):
+    """Fallback: message score since START_TIME_UTC from raw message rows."""
+    # PostgREST serializes DECIMAL columns as JSON numbers, so no float() coercion is needed.
+    pages = iter_pages(lambda: get_client().table("messages").select("base_score, nlp_score_multiplier").eq("user_id", user_id).gte("created_at", START_TIME_UTC).order("message_id"))
+    return math.fsum(m["base_score"] * m["nlp_score_multiplier"] for page in pages for m in page)
+
+def fetch_reaction_weights(user_id, message_ids):
+    """Weights of reactions CREATED this week on message_ids, excluding self-reactions."""
+    # Paged on the unique id: a chunk can have more than max-rows reactions this week.
+    pages = iter_pages(lambda: get_client().table("reactions").select("weight").in_("message_id", message_ids).gte("created_at", START_TIME_UTC).neq("user_id", user_id).order("id"))
+    return [r["weight"] for page in pages for r in page]
+
+async def calc_reaction_score_client(user_id):
+    """Fallback: reaction score (received) since START_TIME_UTC from raw reaction rows."""
+    # Note: Efficiently fetching reactions is hard without message IDs.
+    # The user's message IDs are paged in and each page is matched against reactions
+    # right away, so the full message history is never held at once.
+    pages = iter_pages(lambda: get_client().table("messages").select("message_id").eq("user_id", user_id).order("message_id"))
+    weights = []
+    while (page := await asyncio.to_thread(next, pages, None)) is not None:
+        user_msg_ids = [m["message_id"] for m in page]
+        # One in.(...) query per IN_CHUNK_SIZE ids keeps each URL short; the chunks run concurrently.
+        results = await asyncio.gather(*(
+            asyncio.to_thread(fetch_reaction_weights, user_id, user_msg_ids[i:i + IN_CHUNK_SIZE])
+            for i in range(0, len(user_msg_ids), IN_CHUNK_SIZE)
+        ))
+        for chunk_weights in results:
+            weights.extend(chunk_weights)
+    return math.fsum(weights)
+
+async def calc_weekly_scores_client(user_id):
+    """Fallback: aggregate (message score, reaction score) from raw rows."""
+    # The two halves share no data, so their queries run side by side
+    # (supabase-py is sync, hence the worker threads).
+    return await asyncio.gather(
+        asyncio.to_thread(calc_message_score_client, user_id),
+        calc_reaction_score_client(user_id),
+    )
+
+async def calc_weekly_scores(user_id):
+    """(message score, reaction score) since START_TIME_UTC, summed in the database when possible."""
+    global _rpc_missing
+    if not _rpc_missing:
+        try:
+            resp = await asyncio.to_thread(get_client().rpc("verify_weekly_score", {"uid": user_id, "since": START_TIME_UTC}).execute)
+            row = (resp.data or [{}])[0]
+            return float(row.get("msg_score") or 0), float(row.get("reaction_score") or 0)
+        except Exception as e:
+            if is_missing_function_error(e):
+                _rpc_missing = True
+                print(f"verify_weekly_score RPC unavailable ({e}); aggregating client-side.")
+            else:
+                print(f"verify_weekly_score RPC failed for {user_id} ({e}); aggregating client-side.")
+    return await calc_weekly_scores_client(user_id)
 
 async def restore_all_users():
     print(f"--- Restoring Weekly Scores (Since {START_TIME_UTC}) ---")
 
-    # 1. Fetch all users
-    # Adjust Limit if needed. Assuming < 1000 users.
-    users_resp = client.table("users").select("user_id, username").execute()
-    users = users_resp.data
+    # 1. Fetch all users (paged, so servers with more than max-rows users are covered)
+    users = await asyncio.to_thread(lambda: [u for page in iter_pages(lambda: get_client().table("users").select("user_id, username").order("user_id")) for u in page])
     
     if not users:
         print("No users found.")
@@ -40,42 +129,14 @@ async def restore_all_users():
     for user in users:
         user_id = user["user_id"]
         username = user["username"]
-        
-        # Calculate Message Score
-        msgs_resp = client.table("messages").select("base_score, nlp_score_multiplier").eq("user_id", user_id).gte("created_at", START_TIME_UTC).execute()
-        calc_msg_score = 0.0
-        if msgs_resp.data:
-            for m in msgs_resp.data:
-                calc_msg_score += float(m["base_score"]) * float(m["nlp_score_multiplier"])
-
-        # Calculate Reaction Score (Received)
-        # Note: Efficiently fetching reactions is hard without message IDs.
-        # Fetching user's message IDs first.
-        user_msgs_resp = client.table("messages").select("message_id").eq("user_id", user_id).execute()
-        user_msg_ids = [m["message_id"] for m in user_msgs_resp.data]
-        
-        calc_reaction_score = 0.0
-        if user_msg_ids:
-            # Check reactions on these messages CREATED this week
-            # We fetch user_id to exclude self-reaction
-            reactions_resp = client.table("reactions").select("message_id, user_id, weight").gte("created_at", START_TIME_UTC).execute()
-            
-            # This fetches ALL reactions this week. We filter in memory.
-            # This is inefficient if millions of reactions, but likely small for now.
-            # Better: fetch reactions for EACH message? Too many requests.
-            # Better: filtered list in memory.
-            if reactions_resp.data:
-                for r in reactions_resp.data:
-                    if r["message_id"] in user_msg_ids:
-                        if r["user_id"] != user_id: # Exclude self
-                            calc_reaction_score += float(r["weight"])
-        
+
+        calc_msg_score, calc_reaction_score = await calc_weekly_scores(user_id)
         total_score = calc_msg_score + calc_reaction_score
         
         if total_score > 0:
             print(f"Restoring {username}: {total_score:.2f} pts")
             # Update DB
-            client.table("users").update({"weekly_score": total_score}).eq("user_id", user_id).execute()
+            await asyncio.to_thread(get_client().table("users").update({"weekly_score": total_score}).eq("user_id", user_id).execute)
             update_count += 1
             total_restored_points += total_score
         
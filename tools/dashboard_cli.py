@@ -6,24 +6,37 @@ import base64
 import curses
 import hashlib
 import json
-import math
 import os
+import pickle
 import re
 import secrets
 import sys
 import threading
 import time
 import webbrowser
-from collections import defaultdict
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from src.tui_auth import ensure_tui_auth_session
+from functools import lru_cache
+from heapq import nlargest
+from itertools import accumulate
+from src.tui_auth import (
+    DEFAULT_AUTH_TIMEOUT,
+    SESSION_DIR_NAME,
+    AuthError,
+    _to_int,
+    ensure_tui_auth_session,
+)
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 from urllib.error import HTTPError, URLError
 from urllib.parse import parse_qs, urlencode, urlparse
 from urllib.request import Request, urlopen
 
+import httpx
 from dotenv import load_dotenv
 from supabase import Client, create_client
 from supabase.lib.client_options import SyncClientOptions
@@ -51,16 +64,23 @@ PAGE_TITLES = {
     "governance": "Governance",
     "operations": "Operations",
 }
+HELP_LINE = "q:quit tab/arrow:page r:refresh a:auto +/-:limit [ ]:days u:focus auto-top"
 
 CATEGORY_ORDER = ["INFO", "INSIGHT", "VIBE", "OPS", "MISC"]
+# Per-user category stats are flat lists indexed by CATEGORY_ORDER position.
+CATEGORY_INDEX = {cat: i for i, cat in enumerate(CATEGORY_ORDER)}
 CATEGORY_CP = {"INFO": 5.0, "INSIGHT": 4.0, "VIBE": 3.0, "OPS": 4.0, "MISC": 1.0}
 
 REACTION_GIVE_CP = 1.0
 DEFAULT_TS = 100.0
 MAX_VP = 6
+HEATMAP_SLOTS = 7 * 24
+# VP = floor(log2(effective_cp + 1)) + 1  <=>  effective CP needed for VP k+1 is 2**k - 1.
+VP_THRESHOLDS = tuple(2**k - 1 for k in range(1, MAX_VP))
 
 URL_RE = re.compile(r"(https?://\S+|www\.\S+)", re.IGNORECASE)
-NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+# Matches once the text holds at least 5 word characters; stops scanning there.
+MEANINGFUL_RE = re.compile(r"(?:[\W_]*[^\W_]){5}", re.UNICODE)
 
 OPS_CHANNEL_HINTS = (
     "ops",
@@ -102,6 +122,19 @@ HOBBY_CHANNEL_HINTS = (
     "anime",
 )
 
+# Bump when the model / source-row layout changes so cached pickles are not reused.
+MODEL_FORMAT = 9
+
+# Concurrent range/IN-chunk requests per fetch (one shared client, pooled connections).
+FETCH_WORKERS = 8
+
+# Incremental fetches re-read this far behind the newest cached row: created_at comes
+# from NOW() at insert, so a row can commit after a newer one was already read.
+REFRESH_OVERLAP = timedelta(minutes=5)
+# Non-TUI runs do a full rescan once the last one is this many cache TTLs old, so rows
+# backfilled behind the overlap window are eventually picked up.
+PRIOR_MAX_TTLS = 4
+
 DESIGN_TABLES = [
     "members",
     "cp_ledger",
@@ -114,12 +147,29 @@ DESIGN_TABLES = [
     "quests",
 ]
 
-    new_session = _perform_browser_login(supabase_url, apikey, timeout_sec)
-    user = _fetch_auth_user(supabase_url, apikey, new_session["access_token"])
-    if user:
-        new_session["user"] = user
-    _save_session(session_file, new_session)
-    return new_session
+# (command, fixed status or tables that must all exist for READY, backend note)
+COMMAND_READINESS: list[tuple[str, str | tuple[str, ...], str]] = [
+    ("/mystats", "READY", "derived from users/messages/reactions"),
+    ("/leaderboard", "READY", "30d CP ranking"),
+    ("/leaderboard category", "READY", "category leaderboard"),
+    ("/history", "PARTIAL", "derived daily history, cp_ledger not ready"),
+    ("/mytitles /settitle", ("achievements", "member_achievements"), "requires achievements tables"),
+    ("/vote create /vote list", ("votes",), "requires votes tables"),
+    ("/issue create /issue list", ("issues",), "requires issues table"),
+    ("/quest create", ("quests",), "requires quests table"),
+    ("/dispute", "PENDING", "review/dispute schema not found in current DB"),
+]
+COMMAND_HEADERS = ["Command", "Status", "Backend"]
+# Every cell of the command table is known up front, so its widths are too.
+COMMAND_COL_WIDTHS = [
+    max(len(COMMAND_HEADERS[0]), *(len(c) for c, _, _ in COMMAND_READINESS)),
+    max(
+        len(COMMAND_HEADERS[1]),
+        # Table-backed commands resolve to READY or PENDING at render time.
+        *(len(status) for status in {r for _, r, _ in COMMAND_READINESS if isinstance(r, str)} | {"READY", "PENDING"}),
+    ),
+    max(len(COMMAND_HEADERS[2]), *(len(b) for _, _, b in COMMAND_READINESS)),
+]
 
 
 def parse_args() -> argparse.Namespace:
@@ -148,7 +198,7 @@ def parse_args() -> argparse.Namespace:
         "--refresh",
         type=float,
         default=15.0,
-        help="Auto refresh interval in seconds for TUI",
+        help="Auto refresh interval in seconds for TUI (also the non-TUI model cache TTL)",
     )
     parser.add_argument(
         "--user",
@@ -185,6 +235,11 @@ def parse_args() -> argparse.Namespace:
         default=20.0,
         help="Supabase request timeout seconds (default: 20)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk core model cache",
+    )
     parser.add_argument(
         "--tui",
         action="store_true",
@@ -216,7 +271,19 @@ def get_client(timeout_sec: float) -> Client:
     if not url or not key:
         print("Error: SUPABASE_URL and SUPABASE_KEY are required in .env", file=sys.stderr)
         sys.exit(1)
-    options = SyncClientOptions(postgrest_client_timeout=max(5.0, timeout_sec))
+    timeout = max(5.0, timeout_sec)
+    # One pooled HTTP/2 client for every request so concurrent pages reuse TLS sessions.
+    http_client = httpx.Client(
+        timeout=timeout,
+        http2=True,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=FETCH_WORKERS * 2,
+            max_keepalive_connections=20,
+            keepalive_expiry=60.0,
+        ),
+    )
+    options = SyncClientOptions(postgrest_client_timeout=timeout, httpx_client=http_client)
     return create_client(url, key, options=options)
 
 
@@ -244,67 +311,120 @@ def clip(text: str, width: int) -> str:
     return text[: width - 3] + "..."
 
 
-def render_table_lines(headers: list[str], rows: list[list[Any]], width: int) -> list[str]:
+def render_table_lines(
+    headers: list[str],
+    rows: list[list[Any]],
+    width: int,
+    col_widths: list[int] | None = None,
+) -> list[str]:
+    """Render an aligned text table; pass ``col_widths`` when known to skip the width scan."""
     if not rows:
         return ["(no data)"]
 
     str_rows = [[str(c) for c in row] for row in rows]
-    col_widths = [len(h) for h in headers]
-    for row in str_rows:
-        for i, cell in enumerate(row):
-            col_widths[i] = max(col_widths[i], len(cell))
-
-    lines: list[str] = []
-    header_line = " | ".join(headers[i].ljust(col_widths[i]) for i in range(len(headers)))
-    sep_line = "-+-".join("-" * col_widths[i] for i in range(len(headers)))
-    lines.append(clip(header_line, width))
-    lines.append(clip(sep_line, width))
-    for row in str_rows:
-        line = " | ".join(row[i].ljust(col_widths[i]) for i in range(len(headers)))
-        lines.append(clip(line, width))
+    if col_widths is None:
+        col_widths = [len(h) for h in headers]
+        for row in str_rows:
+            for i, cell in enumerate(row):
+                col_widths[i] = max(col_widths[i], len(cell))
+
+    # One format template per table instead of a ljust/join per cell.
+    fmt = " | ".join(f"{{{i}:<{w}}}" for i, w in enumerate(col_widths))
+    lines = [
+        clip(fmt.format(*headers), width),
+        clip("-+-".join("-" * w for w in col_widths), width),
+    ]
+    lines.extend(clip(fmt.format(*row), width) for row in str_rows)
     return lines
 
 
 def parse_dt(value: Any) -> datetime | None:
     if value is None:
         return None
-    s = str(value).strip()
-    if not s:
-        return None
-    if s.endswith("Z"):
-        s = s[:-1] + "+00:00"
+    # Fast path: PostgREST timestamps are clean ISO-8601 strings that
+    # fromisoformat (3.11+) parses directly, "Z" suffix included.
     try:
-        dt = datetime.fromisoformat(s)
-    except ValueError:
-        return None
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        s = str(value).strip()
+        if not s:
+            return None
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        try:
+            dt = datetime.fromisoformat(s)
+        except ValueError:
+            return None
+    if dt.tzinfo is timezone.utc:
+        return dt
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
+        return dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
 
-def fetch_all_rows(client: Client, table: str, columns: str, chunk_size: int = 1000) -> list[dict[str, Any]]:
+def fetch_pages(
+    fetch_page: Callable[[int, int], list[dict[str, Any]]],
+    total_rows: int,
+    chunk_size: int = 1000,
+) -> list[dict[str, Any]]:
+    """Fetch ``total_rows`` as concurrent ``[start, end]`` range pages, keeping page order."""
+    if total_rows <= 0:
+        return []
+    ranges = [
+        (start, min(start + chunk_size, total_rows) - 1)
+        for start in range(0, total_rows, chunk_size)
+    ]
+    if len(ranges) == 1:
+        return fetch_page(*ranges[0])
     rows: list[dict[str, Any]] = []
-    start = 0
-    while True:
-        end = start + chunk_size - 1
-        resp = client.table(table).select(columns).range(start, end).execute()
-        batch = resp.data or []
-        rows.extend(batch)
-        if len(batch) < chunk_size:
-            break
-        start += chunk_size
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(ranges))) as pool:
+        for batch in pool.map(lambda r: fetch_page(*r), ranges):
+            rows.extend(batch)
     return rows
 
 
-def try_fetch_all_rows(client: Client, table: str, columns: str) -> tuple[list[dict[str, Any]], str | None]:
+def fetch_all_rows(
+    client: Client,
+    table: str,
+    columns: str,
+    order_column: str,
+    chunk_size: int = 1000,
+) -> list[dict[str, Any]]:
+    """Fetch every row of ``table``; ``order_column`` must be unique so range pages never overlap."""
+    resp = client.table(table).select(columns, count="exact", head=True).execute()
+    total = as_int(resp.count)
+
+    def fetch_page(start: int, end: int) -> list[dict[str, Any]]:
+        return client.table(table).select(columns).order(order_column).range(start, end).execute().data or []
+
+    return fetch_pages(fetch_page, total, chunk_size)
+
+
+def try_fetch_all_rows(
+    client: Client, table: str, columns: str, order_column: str
+) -> tuple[list[dict[str, Any]], str | None]:
     try:
-        return fetch_all_rows(client, table, columns), None
+        return fetch_all_rows(client, table, columns, order_column), None
     except Exception as exc:
         return [], str(exc)
 
 
-def chunked(values: list[int], size: int) -> list[list[int]]:
-    return [values[i : i + size] for i in range(0, len(values), size)]
+def chunked(values: list[int], size: int) -> Iterator[list[int]]:
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
+
+
+def fetch_chunks(
+    fetch_chunk: Callable[[list[int]], list[dict[str, Any]]],
+    values: list[int],
+    size: int,
+) -> list[dict[str, Any]]:
+    workers = max(1, min(FETCH_WORKERS, -(-len(values) // size)))
+    rows: list[dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in pool.map(fetch_chunk, chunked(values, size)):
+            rows.extend(batch)
+    return rows
 
 
 def fetch_rows_window(
@@ -312,84 +432,199 @@ def fetch_rows_window(
     table: str,
     columns: str,
     date_column: str,
+    key_column: str,
     since_dt: datetime,
     max_rows: int,
     chunk_size: int = 1000,
-) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
-    start = 0
-    max_rows = max(1, max_rows)
-    while len(rows) < max_rows:
-        remaining = max_rows - len(rows)
-        take = min(chunk_size, remaining)
-        end = start + take - 1
+    transform: Callable[[dict[str, Any]], Any] | None = None,
+) -> list[Any]:
+    """Fetch the newest ``max_rows`` rows since ``since_dt``.
+
+    ``key_column`` must be unique: it breaks ``date_column`` ties (batch inserts share
+    one NOW()) so the concurrent range pages never overlap or skip rows.
+    ``transform`` maps each raw row as its page arrives; rows it maps to None are dropped.
+    """
+    since_iso = since_dt.isoformat()
+    resp = (
+        client.table(table)
+        .select(date_column, count="exact", head=True)
+        .gte(date_column, since_iso)
+        .execute()
+    )
+    total = min(max(1, max_rows), as_int(resp.count))
+
+    def fetch_page(start: int, end: int) -> list[dict[str, Any]]:
         resp = (
             client.table(table)
             .select(columns)
-            .gte(date_column, since_dt.isoformat())
+            .gte(date_column, since_iso)
             .order(date_column, desc=True)
+            .order(key_column)
             .range(start, end)
             .execute()
         )
-        batch = resp.data or []
-        rows.extend(batch)
-        if len(batch) < take:
-            break
-        start += take
+        rows = resp.data or []
+        if transform is None:
+            return rows
+        return [packed for packed in map(transform, rows) if packed is not None]
+
+    return fetch_pages(fetch_page, total, chunk_size)
+
+
+def refresh_rows_window(
+    client: Client,
+    table: str,
+    columns: str,
+    date_column: str,
+    key_column: str,
+    since_dt: datetime,
+    max_rows: int,
+    prior_rows: list[tuple[Any, ...]] | None,
+    pack: Callable[[dict[str, Any]], tuple[Any, ...] | None],
+) -> list[tuple[Any, ...]]:
+    """Fetch rows from just before the newest of ``prior_rows`` and merge (newest first).
+
+    ``pack`` turns raw rows into tuples starting with ``(timestamp, key, ...)``.
+    """
+    if not prior_rows:
+        return fetch_rows_window(
+            client, table, columns, date_column, key_column, since_dt, max_rows, transform=pack
+        )
+
+    fetch_since = max(prior_rows[0][0] - REFRESH_OVERLAP, since_dt)
+    fresh = fetch_rows_window(
+        client, table, columns, date_column, key_column, fetch_since, max_rows, transform=pack
+    )
+    fresh_keys = {row[1] for row in fresh}
+    rows = fresh + [row for row in prior_rows if row[1] not in fresh_keys]
+    del rows[max(1, max_rows) :]
+    # Rows are newest first, so whatever slid out of the window sits at the tail.
+    while rows and rows[-1][0] < since_dt:
+        rows.pop()
     return rows
 
 
+# (timestamp, message_id, user_id, channel_id, category index)
+MessageRow = tuple[datetime, int, int, int, int]
+# (timestamp, reaction id, user_id, message_id)
+ReactionRow = tuple[datetime, Any, int, int]
+
+
+def pack_reaction(row: dict[str, Any]) -> ReactionRow | None:
+    ts = parse_dt(row.get("created_at"))
+    if ts is None:
+        return None
+    return ts, row.get("id"), as_int(row.get("user_id")), as_int(row.get("message_id"))
+
+
+# PostgREST / Postgres codes for an unknown column, table or function.
+MISSING_OBJECT_CODES = frozenset({"42703", "42P01", "42883", "PGRST202", "PGRST204", "PGRST205"})
+
+
+def is_missing_object_error(exc: Exception) -> bool:
+    """True when the error says the queried object does not exist (as opposed to a transient failure)."""
+    return str(getattr(exc, "code", "") or "") in MISSING_OBJECT_CODES
+
+
+# Set once select_users_by_ids (migrations/006) is found missing; falls back to IN chunks.
+_users_rpc_missing = False
+# PostgREST caps every response (RPC results included) at max-rows, 1000 by default.
+USERS_RPC_CHUNK = 1000
+
+
 def fetch_users_by_ids(client: Client, user_ids: list[int]) -> list[dict[str, Any]]:
+    global _users_rpc_missing
     if not user_ids:
         return []
-    rows: list[dict[str, Any]] = []
-    for ids in chunked(user_ids, 400):
+    if not _users_rpc_missing:
+        try:
+            return fetch_chunks(
+                lambda ids: client.rpc("select_users_by_ids", {"ids": ids}).execute().data or [],
+                user_ids,
+                USERS_RPC_CHUNK,
+            )
+        except Exception as exc:
+            # Only a missing function disables the RPC; other failures fall back for this call.
+            if is_missing_object_error(exc):
+                _users_rpc_missing = True
+
+    def fetch_chunk(ids: list[int]) -> list[dict[str, Any]]:
         resp = (
             client.table("users")
             .select("user_id,username,current_score,weekly_score")
             .in_("user_id", ids)
             .execute()
         )
-        rows.extend(resp.data or [])
-    return rows
+        return resp.data or []
+
+    return fetch_chunks(fetch_chunk, user_ids, 400)
+
+
+MEMBERS_ID_CANDIDATES = ("user_id", "member_id", "discord_user_id", "id")
+MEMBERS_TS_COLUMNS = "ts,trust_score,ts_score,trust"
+
+# Resolved members id column: None = not probed yet, "" = no usable column.
+_members_id_col: str | None = None
+
+
+def resolve_members_id_col(client: Client) -> str:
+    global _members_id_col
+    if _members_id_col is not None:
+        return _members_id_col
+    for id_col in MEMBERS_ID_CANDIDATES:
+        try:
+            client.table("members").select(f"{id_col},{MEMBERS_TS_COLUMNS}").limit(1).execute()
+        except Exception as exc:
+            if is_missing_object_error(exc):
+                continue
+            # Transient failure: stay unresolved so the next build probes again.
+            return ""
+        _members_id_col = id_col
+        return id_col
+    _members_id_col = ""
+    return _members_id_col
 
 
 def fetch_members_ts_by_ids(client: Client, user_ids: list[int]) -> dict[int, float]:
     if not user_ids:
         return {}
-    id_candidates = ["user_id", "member_id", "discord_user_id", "id"]
+    id_col = resolve_members_id_col(client)
+    if not id_col:
+        return {}
     ts_map: dict[int, float] = {}
-    for id_col in id_candidates:
-        try:
-            for ids in chunked(user_ids, 400):
-                resp = (
-                    client.table("members")
-                    .select(f"{id_col},ts,trust_score,ts_score,trust")
-                    .in_(id_col, ids)
-                    .execute()
-                )
-                for row in resp.data or []:
-                    uid = as_int(row.get(id_col))
-                    if uid == 0:
-                        continue
-                    ts = as_float(
-                        row.get("ts")
-                        or row.get("trust_score")
-                        or row.get("ts_score")
-                        or row.get("trust")
-                        or DEFAULT_TS
-                    )
-                    ts_map[uid] = max(0.0, min(100.0, ts))
-            if ts_map:
-                return ts_map
-        except Exception:
+    try:
+        rows = fetch_chunks(
+            lambda ids: (
+                client.table("members")
+                .select(f"{id_col},{MEMBERS_TS_COLUMNS}")
+                .in_(id_col, ids)
+                .execute()
+                .data
+                or []
+            ),
+            user_ids,
+            400,
+        )
+    except Exception:
+        return ts_map
+    for row in rows:
+        uid = as_int(row.get(id_col))
+        if uid == 0:
             continue
+        ts = as_float(
+            row.get("ts")
+            or row.get("trust_score")
+            or row.get("ts_score")
+            or row.get("trust")
+            or DEFAULT_TS
+        )
+        ts_map[uid] = max(0.0, min(100.0, ts))
     return ts_map
 
 
 def contains_any(text: str, keywords: tuple[str, ...]) -> bool:
     lowered = text.lower()
-    return any(k.lower() in lowered for k in keywords)
+    return any(k in lowered for k in keywords)
 
 
 def normalize_channel_name(name: str | None, channel_id: Any) -> str:
@@ -407,16 +642,20 @@ def channel_weight(channel_name: str) -> float:
     return 1.0
 
 
-def classify_message(content: Any, channel_name: str) -> str:
+def channel_profile(channel_name: str) -> tuple[str, float, bool]:
+    """Resolve (name, weight, is_ops) once per channel instead of per message."""
+    return channel_name, channel_weight(channel_name), contains_any(channel_name, OPS_CHANNEL_HINTS)
+
+
+def classify_message(content: Any, is_ops_channel: bool) -> str:
     text = str(content or "").strip()
     if not text:
         return "MISC"
     if URL_RE.search(text):
         return "INFO"
-    if contains_any(channel_name, OPS_CHANNEL_HINTS):
+    if is_ops_channel:
         return "OPS"
-    meaningful = NON_WORD_RE.sub("", text)
-    if len(meaningful) < 5:
+    if MEANINGFUL_RE.match(text) is None:
         return "VIBE"
     if len(text) > 200:
         return "INSIGHT"
@@ -426,8 +665,22 @@ def classify_message(content: Any, channel_name: str) -> str:
 def calc_vp(effective_cp_total: float) -> int:
     if effective_cp_total <= 0:
         return 1
-    vp = int(math.floor(math.log2(effective_cp_total + 1.0)) + 1)
-    return max(1, min(MAX_VP, vp))
+    return 1 + bisect_right(VP_THRESHOLDS, effective_cp_total)
+
+
+def calc_streaks(activity_mask: int, today_bit: int) -> tuple[int, int]:
+    """Return (longest, current) streaks from a day bitset (bit i = scan day i)."""
+    longest = 0
+    mask = activity_mask
+    while mask:
+        mask &= mask >> 1
+        longest += 1
+
+    if today_bit < 0:
+        return longest, 0
+    window = (1 << (today_bit + 1)) - 1
+    gaps = ~activity_mask & window
+    return longest, today_bit + 1 - gaps.bit_length()
 
 
 def build_core_model(
@@ -437,59 +690,100 @@ def build_core_model(
     max_messages: int,
     max_reactions: int,
     max_users: int,
+    prior: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
+    """Build the dashboard model.
+
+    With ``prior`` (a model built for the same scan scope), only rows newer than
+    the prior scan are fetched and merged into its source rows before aggregating.
+    """
     now = datetime.now(timezone.utc)
     scan_days = max(30, trend_days, lookback_days)
     since_dt = now - timedelta(days=scan_days)
+    scan_params = (MODEL_FORMAT, scan_days, max_messages, max_reactions)
+    if prior is not None and prior.get("scan_params") != scan_params:
+        prior = None
+
+    channels, _ = try_fetch_all_rows(client, "channels", "channel_id,name,type", "channel_id")
+    channel_profile_by_id: dict[int, tuple[str, float, bool]] = {}
+    for channel in channels:
+        channel_id = as_int(channel.get("channel_id"))
+        channel_profile_by_id[channel_id] = channel_profile(
+            normalize_channel_name(channel.get("name"), channel_id)
+        )
 
-    messages = fetch_rows_window(
+    def resolve_channel(channel_id: int) -> tuple[str, float, bool]:
+        profile = channel_profile_by_id.get(channel_id)
+        if profile is None:
+            profile = channel_profile(f"channel-{channel_id}")
+            channel_profile_by_id[channel_id] = profile
+        return profile
+
+    def pack_message(row: dict[str, Any]) -> MessageRow | None:
+        # Parse and classify as each page arrives: message bodies are never held for
+        # the whole scan, and rows carried into incremental refreshes are never re-parsed.
+        ts = parse_dt(row.get("timestamp") or row.get("created_at"))
+        if ts is None:
+            return None
+        channel_id = as_int(row.get("channel_id"))
+        _, _, is_ops = resolve_channel(channel_id)
+        cat_idx = CATEGORY_INDEX[classify_message(row.get("content"), is_ops)]
+        return ts, as_int(row.get("message_id")), as_int(row.get("user_id")), channel_id, cat_idx
+
+    messages = refresh_rows_window(
         client,
         "messages",
         "message_id,user_id,channel_id,content,timestamp,created_at",
         "timestamp",
+        "message_id",
         since_dt,
         max_messages,
+        prior["source_messages"] if prior else None,
+        pack_message,
     )
-    reactions = fetch_rows_window(
+    reactions = refresh_rows_window(
         client,
         "reactions",
-        "message_id,user_id,created_at,weight",
+        "id,message_id,user_id,created_at,weight",
         "created_at",
+        "id",
         since_dt,
         max_reactions,
+        prior["source_reactions"] if prior else None,
+        pack_reaction,
     )
-    channels, _ = try_fetch_all_rows(client, "channels", "channel_id,name,type")
+    source_messages = messages
+    source_reactions = reactions
 
     # Track only active users in the scan scope to avoid full-table user fetch.
     seen_user_ids: list[int] = []
     seen_user_set: set[int] = set()
-    for row in messages:
-        uid = as_int(row.get("user_id"))
+    for msg in messages:
+        uid = msg[2]
         if uid and uid not in seen_user_set:
             seen_user_set.add(uid)
             seen_user_ids.append(uid)
-    for row in reactions:
-        uid = as_int(row.get("user_id"))
+    for reaction in reactions:
+        uid = reaction[2]
         if uid and uid not in seen_user_set:
             seen_user_set.add(uid)
             seen_user_ids.append(uid)
 
     if max_users > 0 and len(seen_user_ids) > max_users:
         keep = set(seen_user_ids[:max_users])
-        messages = [m for m in messages if as_int(m.get("user_id")) in keep]
-        reactions = [r for r in reactions if as_int(r.get("user_id")) in keep]
+        messages = [m for m in messages if m[2] in keep]
+        reactions = [r for r in reactions if r[2] in keep]
         seen_user_ids = seen_user_ids[:max_users]
     users = fetch_users_by_ids(client, seen_user_ids)
     member_ts_by_user = fetch_members_ts_by_ids(client, seen_user_ids)
 
+    since_ord = since_dt.date().toordinal()
     day_30_ago = (now - timedelta(days=30)).date()
     day_7_ago = (now - timedelta(days=7)).date()
     trend_start = (now - timedelta(days=max(1, trend_days) - 1)).date()
-
-    channel_name_by_id: dict[int, str] = {}
-    for channel in channels:
-        channel_id = as_int(channel.get("channel_id"))
-        channel_name_by_id[channel_id] = normalize_channel_name(channel.get("name"), channel_id)
+    # The loops key days by ordinal: int compares/keys instead of per-row date objects.
+    day_30_ord = day_30_ago.toordinal()
+    trend_start_ord = trend_start.toordinal()
 
     user_stats: dict[int, dict[str, Any]] = {}
 
@@ -506,11 +800,11 @@ def build_core_model(
                 "msg_count_30d": 0,
                 "reaction_given_total": 0,
                 "reaction_given_30d": 0,
-                "category_counts": {cat: 0 for cat in CATEGORY_ORDER},
-                "category_cp": {cat: 0.0 for cat in CATEGORY_ORDER},
-                "category_cp_30d": {cat: 0.0 for cat in CATEGORY_ORDER},
+                "category_counts": [0] * len(CATEGORY_ORDER),
+                "category_cp": [0.0] * len(CATEGORY_ORDER),
+                "category_cp_30d": [0.0] * len(CATEGORY_ORDER),
                 "daily_cp": defaultdict(float),
-                "activity_days": set(),
+                "activity_mask": 0,
                 "rank_30d": 0,
                 "rank_total": 0,
             }
@@ -530,101 +824,104 @@ def build_core_model(
     category_totals = {
         cat: {"count": 0, "raw_cp": 0.0, "raw_cp_30d": 0.0} for cat in CATEGORY_ORDER
     }
-    daily_total_cp: dict[Any, float] = defaultdict(float)
-    daily_total_messages: dict[Any, int] = defaultdict(int)
-    daily_active_users: dict[Any, set[int]] = defaultdict(set)
-    heatmap_messages: dict[tuple[int, int], int] = defaultdict(int)
-    heatmap_cp: dict[tuple[int, int], float] = defaultdict(float)
-
-    for message in messages:
-        uid = as_int(message.get("user_id"))
-        mid = as_int(message.get("message_id"))
-        channel_id = as_int(message.get("channel_id"))
+    daily_total_cp: dict[int, float] = defaultdict(float)
+    daily_total_messages: dict[int, int] = defaultdict(int)
+    daily_active_users: dict[int, set[int]] = defaultdict(set)
+    # Flat weekday*24 + hour slots, Monday=0.
+    heatmap_messages = [0] * HEATMAP_SLOTS
+    heatmap_cp = [0.0] * HEATMAP_SLOTS
+    category_totals_by_idx = [category_totals[cat] for cat in CATEGORY_ORDER]
+    # Per channel: (stats row, CP per category index, 30d CP per user), resolved once.
+    channel_ctx: dict[int, tuple[dict[str, Any], list[float], dict[int, float]]] = {}
+
+    for ts, mid, uid, channel_id, cat_idx in messages:
         if uid == 0 or mid == 0:
             continue
-        user = ensure_user(uid)
-        ts = parse_dt(message.get("timestamp") or message.get("created_at"))
-        if ts is None:
-            continue
-        day = ts.date()
-        channel_name = channel_name_by_id.get(channel_id, f"channel-{channel_id}")
-        category = classify_message(message.get("content"), channel_name)
-        base_cp = CATEGORY_CP[category]
-        weight = channel_weight(channel_name)
-        raw_cp = base_cp * weight
+        user = user_stats.get(uid) or ensure_user(uid)
+        ctx = channel_ctx.get(channel_id)
+        if ctx is None:
+            channel_name, weight, _ = resolve_channel(channel_id)
+            channel_stats[channel_id] = {
+                "channel_id": channel_id,
+                "channel_name": channel_name,
+                "weight": weight,
+                "messages_30d": 0,
+                "raw_cp_30d": 0.0,
+                "active_users_30d": set(),
+            }
+            ctx = channel_ctx[channel_id] = (
+                channel_stats[channel_id],
+                [CATEGORY_CP[cat] * weight for cat in CATEGORY_ORDER],
+                channel_user_cp[channel_id],
+            )
+        channel_row, channel_cp, user_cp = ctx
+        day = ts.toordinal()
+        raw_cp = channel_cp[cat_idx]
 
         user["raw_cp_total"] += raw_cp
         user["msg_count_total"] += 1
-        user["category_counts"][category] += 1
-        user["category_cp"][category] += raw_cp
+        user["category_counts"][cat_idx] += 1
+        user["category_cp"][cat_idx] += raw_cp
         user["daily_cp"][day] += raw_cp
-        user["activity_days"].add(day)
+        bit = day - since_ord
+        if bit >= 0:
+            user["activity_mask"] |= 1 << bit
+
+        cat_total = category_totals_by_idx[cat_idx]
+        cat_total["count"] += 1
+        cat_total["raw_cp"] += raw_cp
 
-        if day >= day_30_ago:
+        if day >= day_30_ord:
             user["raw_cp_30d"] += raw_cp
             user["msg_count_30d"] += 1
-            user["category_cp_30d"][category] += raw_cp
-
-        category_totals[category]["count"] += 1
-        category_totals[category]["raw_cp"] += raw_cp
-        if day >= day_30_ago:
-            category_totals[category]["raw_cp_30d"] += raw_cp
-
-        if day >= trend_start:
+            user["category_cp_30d"][cat_idx] += raw_cp
+            cat_total["raw_cp_30d"] += raw_cp
+            channel_row["messages_30d"] += 1
+            channel_row["raw_cp_30d"] += raw_cp
+            channel_row["active_users_30d"].add(uid)
+            user_cp[uid] += raw_cp
+
+        if day >= trend_start_ord:
             daily_total_cp[day] += raw_cp
             daily_total_messages[day] += 1
             daily_active_users[day].add(uid)
 
-        key = (ts.weekday(), ts.hour)  # Monday=0
-        heatmap_messages[key] += 1
-        heatmap_cp[key] += raw_cp
+        slot = (day + 6) % 7 * 24 + ts.hour  # ordinal 1 (0001-01-01) is a Monday
+        heatmap_messages[slot] += 1
+        heatmap_cp[slot] += raw_cp
 
         message_owner[mid] = uid
 
-        if channel_id not in channel_stats:
-            channel_stats[channel_id] = {
-                "channel_id": channel_id,
-                "channel_name": channel_name,
-                "weight": weight,
-                "messages_30d": 0,
-                "raw_cp_30d": 0.0,
-                "active_users_30d": set(),
-            }
-        if day >= day_30_ago:
-            channel_stats[channel_id]["messages_30d"] += 1
-            channel_stats[channel_id]["raw_cp_30d"] += raw_cp
-            channel_stats[channel_id]["active_users_30d"].add(uid)
-            channel_user_cp[channel_id][uid] += raw_cp
-
-    edge_weights: dict[tuple[int, int], float] = defaultdict(float)
-    for reaction in reactions:
-        reactor_id = as_int(reaction.get("user_id"))
-        message_id = as_int(reaction.get("message_id"))
+    edge_pairs: list[tuple[int, int]] = []
+    for ts, _, reactor_id, message_id in reactions:
         if reactor_id == 0:
             continue
-        reactor = ensure_user(reactor_id)
-        ts = parse_dt(reaction.get("created_at"))
-        if ts is None:
-            continue
-        day = ts.date()
+        reactor = user_stats.get(reactor_id) or ensure_user(reactor_id)
+        day = ts.toordinal()
         raw_cp = REACTION_GIVE_CP
 
         reactor["raw_cp_total"] += raw_cp
         reactor["reaction_given_total"] += 1
         reactor["daily_cp"][day] += raw_cp
-        reactor["activity_days"].add(day)
-        if day >= day_30_ago:
+        bit = day - since_ord
+        if bit >= 0:
+            reactor["activity_mask"] |= 1 << bit
+        if day >= day_30_ord:
             reactor["raw_cp_30d"] += raw_cp
             reactor["reaction_given_30d"] += 1
 
-        if day >= trend_start:
+        if day >= trend_start_ord:
             daily_total_cp[day] += raw_cp
             daily_active_users[day].add(reactor_id)
 
         target_id = message_owner.get(message_id)
         if target_id and target_id != reactor_id:
-            edge_weights[(reactor_id, target_id)] += 1.0
+            edge_pairs.append((reactor_id, target_id))
+    # Counter tallies in C; ids are 64-bit snowflakes, so pairs stay tuples.
+    edge_weights = Counter(edge_pairs)
 
+    today_bit = now.date().toordinal() - since_ord
+    vp_distribution = [0] * (MAX_VP + 1)  # indexed by VP (1..MAX_VP)
     for uid, stats in user_stats.items():
         ts = max(0.0, min(100.0, as_float(stats["ts"])))
         stats["ts"] = ts
@@ -632,29 +929,12 @@ def build_core_model(
         stats["effective_cp_30d"] = stats["raw_cp_30d"] * (ts / 100.0)
         vp = calc_vp(stats["effective_cp_total"])
         stats["vp"] = vp
-        stats["effective_vp"] = max(1, int(math.floor(vp * (ts / 100.0))))
-
-        days = sorted(stats["activity_days"])
-        stats["current_streak"] = 0
-        stats["longest_streak"] = 0
-        if days:
-            longest = 1
-            run = 1
-            for i in range(1, len(days)):
-                if days[i] == days[i - 1] + timedelta(days=1):
-                    run += 1
-                else:
-                    run = 1
-                longest = max(longest, run)
-            stats["longest_streak"] = longest
-
-            cursor = now.date()
-            streak = 0
-            day_set = stats["activity_days"]
-            while cursor in day_set:
-                streak += 1
-                cursor -= timedelta(days=1)
-            stats["current_streak"] = streak
+        vp_distribution[vp] += 1
+        stats["effective_vp"] = max(1, int(vp * (ts / 100.0)))
+
+        stats["longest_streak"], stats["current_streak"] = calc_streaks(
+            stats["activity_mask"], today_bit
+        )
 
     ranked_30d = sorted(
         user_stats.values(), key=lambda u: (u["effective_cp_30d"], u["raw_cp_30d"]), reverse=True
@@ -666,12 +946,14 @@ def build_core_model(
         row["rank_30d"] = i
     for i, row in enumerate(ranked_total, start=1):
         row["rank_total"] = i
+    # Running effective CP over ranked_total: [-1] is the total, [n - 1] the top-n sum.
+    effective_cp_cumsum = list(accumulate(u["effective_cp_total"] for u in ranked_total))
 
     channel_rows: list[dict[str, Any]] = []
     for channel_id, row in channel_stats.items():
-        leaders = sorted(channel_user_cp[channel_id].items(), key=lambda kv: kv[1], reverse=True)
-        champ_user_id = leaders[0][0] if leaders else 0
-        champ_cp = leaders[0][1] if leaders else 0.0
+        champ_user_id, champ_cp = max(
+            channel_user_cp[channel_id].items(), key=itemgetter(1), default=(0, 0.0)
+        )
         champ_name = user_stats.get(champ_user_id, {}).get("username", "-")
         channel_rows.append(
             {
@@ -688,35 +970,41 @@ def build_core_model(
         )
     channel_rows.sort(key=lambda x: x["raw_cp_30d"], reverse=True)
 
-    top_edges = sorted(edge_weights.items(), key=lambda kv: kv[1], reverse=True)
+    # Graph and category leaderboards are only shown top-N; lines_* pick them with nlargest.
     node_degree: dict[int, float] = defaultdict(float)
-    for (source, target), weight in top_edges:
+    for (source, target), weight in edge_weights.items():
         node_degree[source] += weight
         node_degree[target] += weight
-    top_nodes = sorted(node_degree.items(), key=lambda kv: kv[1], reverse=True)
 
     category_leaderboards: dict[str, list[tuple[str, int, float]]] = {}
-    for category in CATEGORY_ORDER:
+    for cat_idx, category in enumerate(CATEGORY_ORDER):
         rows: list[tuple[str, int, float]] = []
         for u in user_stats.values():
-            count = as_int(u["category_counts"][category])
-            cp = as_float(u["category_cp_30d"][category])
+            count = u["category_counts"][cat_idx]
+            cp = u["category_cp_30d"][cat_idx]
             if count <= 0 and cp <= 0:
                 continue
             rows.append((u["username"], count, cp))
-        rows.sort(key=lambda t: t[2], reverse=True)
         category_leaderboards[category] = rows
 
     model = {
         "generated_at": now,
+        # When the rows were last fetched in full; incremental builds carry it forward.
+        "full_scan_at": prior["full_scan_at"] if prior else now,
+        "scan_params": scan_params,
+        "source_messages": source_messages,
+        "source_reactions": source_reactions,
         "scan_days": scan_days,
         "scan_since": since_dt,
         "users_count": len(user_stats),
         "messages_count": len(messages),
         "reactions_count": len(reactions),
         "stats_by_user": user_stats,
+        "user_names": {uid: stats["username"] for uid, stats in user_stats.items()},
         "ranked_30d": ranked_30d,
         "ranked_total": ranked_total,
+        "vp_distribution": vp_distribution,
+        "effective_cp_cumsum": effective_cp_cumsum,
         "category_totals": category_totals,
         "category_leaderboards": category_leaderboards,
         "channel_rows": channel_rows,
@@ -725,14 +1013,66 @@ def build_core_model(
         "daily_active_users": daily_active_users,
         "heatmap_messages": heatmap_messages,
         "heatmap_cp": heatmap_cp,
-        "top_edges": top_edges,
-        "top_nodes": top_nodes,
+        "edge_weights": edge_weights,
+        "node_degree": node_degree,
         "day_7_ago": day_7_ago,
         "day_30_ago": day_30_ago,
     }
     return model
 
 
+def model_cache_path(
+    trend_days: int,
+    lookback_days: int,
+    max_messages: int,
+    max_reactions: int,
+    max_users: int,
+) -> Path:
+    configured = os.getenv("DASHBOARD_CACHE_DIR", "").strip()
+    cache_dir = Path(configured).expanduser() if configured else Path.home() / SESSION_DIR_NAME / "cache"
+    scope = "|".join(
+        str(v)
+        for v in (
+            MODEL_FORMAT,
+            os.getenv("SUPABASE_URL", "").strip(),
+            trend_days,
+            lookback_days,
+            max_messages,
+            max_reactions,
+            max_users,
+        )
+    )
+    key = hashlib.sha256(scope.encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"model-{key}.pkl"
+
+
+def load_cached_model(path: Path, max_age_sec: float | None = None) -> dict[str, Any] | None:
+    """Load a pickled core model; ``max_age_sec=None`` accepts stale entries."""
+    try:
+        if max_age_sec is not None and time.time() - path.stat().st_mtime > max_age_sec:
+            return None
+        with open(path, "rb") as f:
+            model = pickle.load(f)
+    except Exception:
+        return None
+    return model if isinstance(model, dict) else None
+
+
+def save_cached_model(path: Path, model: dict[str, Any]) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.chmod(0o600)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
 def resolve_focus_user(model: dict[str, Any], selector: str) -> dict[str, Any] | None:
     ranked = model["ranked_30d"]
     if not ranked:
@@ -794,12 +1134,13 @@ def lines_overview(model: dict[str, Any], days: int, width: int) -> list[str]:
     today = datetime.now(timezone.utc).date()
     days_list = [today - timedelta(days=i) for i in range(max(1, days) - 1, -1, -1)]
     cp_series = model["daily_total_cp"]
-    max_cp = max((as_float(cp_series.get(d, 0.0)) for d in days_list), default=1.0)
+    max_cp = max((as_float(cp_series.get(d.toordinal(), 0.0)) for d in days_list), default=1.0)
     bar_width = max(8, min(42, width - 28))
     for day in days_list:
-        cp = as_float(cp_series.get(day, 0.0))
-        messages = as_int(model["daily_total_messages"].get(day, 0))
-        active = len(model["daily_active_users"].get(day, set()))
+        day_ord = day.toordinal()
+        cp = as_float(cp_series.get(day_ord, 0.0))
+        messages = as_int(model["daily_total_messages"].get(day_ord, 0))
+        active = len(model["daily_active_users"].get(day_ord, set()))
         unit = int((cp / max_cp) * bar_width) if max_cp > 0 else 0
         bar = "#" * max(unit, 1 if cp > 0 else 0)
         lines.append(clip(f"{day} | {bar:<{bar_width}} CP:{cp:6.1f} msg:{messages:4d} u:{active:3d}", width))
@@ -830,11 +1171,11 @@ def lines_mystats(model: dict[str, Any], selector: str, width: int) -> list[str]
         "Category Breakdown (30d)",
     ]
 
-    total_cat_cp = sum(as_float(user["category_cp_30d"][c]) for c in CATEGORY_ORDER)
+    total_cat_cp = sum(user["category_cp_30d"])
     rows: list[list[Any]] = []
-    for cat in CATEGORY_ORDER:
-        cp = as_float(user["category_cp_30d"][cat])
-        count = as_int(user["category_counts"][cat])
+    for cat_idx, cat in enumerate(CATEGORY_ORDER):
+        cp = user["category_cp_30d"][cat_idx]
+        count = user["category_counts"][cat_idx]
         share = (cp / total_cat_cp * 100.0) if total_cat_cp > 0 else 0.0
         rows.append([cat, count, f"{cp:.1f}", f"{share:.1f}%"])
     lines.extend(render_table_lines(["Cat", "Msgs", "RawCP30d", "Share"], rows, width))
@@ -843,7 +1184,7 @@ def lines_mystats(model: dict[str, Any], selector: str, width: int) -> list[str]
     lines.append("Recent 7d CP")
     today = datetime.now(timezone.utc).date()
     days = [today - timedelta(days=i) for i in range(6, -1, -1)]
-    values = [as_float(user["daily_cp"].get(d, 0.0)) for d in days]
+    values = [as_float(user["daily_cp"].get(d.toordinal(), 0.0)) for d in days]
     max_cp = max(values) if values else 1.0
     bar_width = max(8, min(35, width - 25))
     for d, cp in zip(days, values):
@@ -884,7 +1225,8 @@ def lines_categories(model: dict[str, Any], limit: int, width: int) -> list[str]
         lines.append("")
         lines.append(f"[{cat}]")
         rows = []
-        for i, (name, count, cp) in enumerate(model["category_leaderboards"][cat][:limit], start=1):
+        leaders = nlargest(limit, model["category_leaderboards"][cat], key=itemgetter(2))
+        for i, (name, count, cp) in enumerate(leaders, start=1):
             rows.append([i, name, count, f"{cp:.1f}"])
         lines.extend(render_table_lines(["Rank", "User", "Msgs", "RawCP30d"], rows, width))
     return lines
@@ -920,42 +1262,47 @@ def lines_channels(model: dict[str, Any], limit: int, width: int) -> list[str]:
 
 def lines_behavior(model: dict[str, Any], width: int) -> list[str]:
     heatmap_messages = model["heatmap_messages"]
-    max_count = max((as_int(v) for v in heatmap_messages.values()), default=0)
+    max_count = max(max(heatmap_messages, default=0), 1)
     levels = " .:-=+*#%@"
+    top_level = len(levels) - 1
 
     day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
     lines = ["Activity Heatmap (message count)", "Hours: 012345678901234567890123"]
     for day in range(7):
-        chars: list[str] = []
-        for hour in range(24):
-            count = as_int(heatmap_messages.get((day, hour), 0))
-            idx = 0 if max_count <= 0 else int((count / max_count) * (len(levels) - 1))
-            chars.append(levels[idx])
-        lines.append(f"{day_names[day]}: {''.join(chars)}")
+        row = heatmap_messages[day * 24 : day * 24 + 24]
+        chars = "".join([levels[count * top_level // max_count] for count in row])
+        lines.append(f"{day_names[day]}: {chars}")
     lines.append("Legend: low=' ' high='@'")
 
-    busiest = sorted(heatmap_messages.items(), key=lambda kv: kv[1], reverse=True)[:5]
+    busiest = nlargest(
+        5,
+        ((slot, count) for slot, count in enumerate(heatmap_messages) if count > 0),
+        key=itemgetter(1),
+    )
     if busiest:
         lines.append("")
         lines.append("Top Time Slots")
         rows = []
-        for (day, hour), count in busiest:
+        for slot, count in busiest:
+            day, hour = divmod(slot, 24)
             rows.append([day_names[day], f"{hour:02d}:00", count])
         lines.extend(render_table_lines(["Day", "Hour", "Messages"], rows, width))
     return [clip(line, width) for line in lines]
 
 
 def lines_graph(model: dict[str, Any], limit: int, width: int) -> list[str]:
-    user_map = model["stats_by_user"]
+    names = model["user_names"]
     edge_rows: list[list[Any]] = []
-    for (source_id, target_id), weight in model["top_edges"][:limit]:
-        source = user_map.get(source_id, {}).get("username", f"user-{source_id}")
-        target = user_map.get(target_id, {}).get("username", f"user-{target_id}")
+    for (source_id, target_id), weight in nlargest(
+        limit, model["edge_weights"].items(), key=itemgetter(1)
+    ):
+        source = names.get(source_id) or f"user-{source_id}"
+        target = names.get(target_id) or f"user-{target_id}"
         edge_rows.append([source, target, int(weight)])
 
     node_rows: list[list[Any]] = []
-    for user_id, degree in model["top_nodes"][:limit]:
-        name = user_map.get(user_id, {}).get("username", f"user-{user_id}")
+    for user_id, degree in nlargest(limit, model["node_degree"].items(), key=itemgetter(1)):
+        name = names.get(user_id) or f"user-{user_id}"
         node_rows.append([name, f"{degree:.0f}"])
 
     lines = ["Social Graph (reactions: source -> target)"]
@@ -968,14 +1315,12 @@ def lines_graph(model: dict[str, Any], limit: int, width: int) -> list[str]:
 
 def lines_governance(model: dict[str, Any], limit: int, width: int) -> list[str]:
     ranked_total = model["ranked_total"]
-    vp_dist: dict[int, int] = defaultdict(int)
-    total_eff = 0.0
-    for user in ranked_total:
-        vp_dist[as_int(user["vp"])] += 1
-        total_eff += as_float(user["effective_cp_total"])
+    vp_dist = model["vp_distribution"]
+    cumsum = model["effective_cp_cumsum"]
+    total_eff = cumsum[-1] if cumsum else 0.0
 
     top_n = min(limit, len(ranked_total))
-    top_eff = sum(as_float(u["effective_cp_total"]) for u in ranked_total[:top_n])
+    top_eff = cumsum[top_n - 1] if top_n > 0 else 0.0
     share = (top_eff / total_eff * 100.0) if total_eff > 0 else 0.0
 
     lines = [
@@ -986,7 +1331,7 @@ def lines_governance(model: dict[str, Any], limit: int, width: int) -> list[str]
         "VP Distribution",
     ]
 
-    dist_rows = [[vp, vp_dist.get(vp, 0)] for vp in range(1, MAX_VP + 1)]
+    dist_rows = [[vp, vp_dist[vp]] for vp in range(1, MAX_VP + 1)]
     lines.extend(render_table_lines(["VP", "Members"], dist_rows, width))
     lines.append("")
     lines.append("Top Governance Weights")
@@ -1014,66 +1359,80 @@ def lines_governance(model: dict[str, Any], limit: int, width: int) -> list[str]
 
 
 def fetch_operations_status(client: Client) -> dict[str, Any]:
-    status: dict[str, Any] = {}
-    for table in DESIGN_TABLES:
+    def probe(table: str) -> dict[str, Any]:
         try:
-            resp = client.table(table).select("*").limit(1).execute()
-            status[table] = {
+            # HEAD + count=exact: the row count comes back in Content-Range, no body.
+            resp = client.table(table).select("*", count="exact", head=True).execute()
+            return {
                 "available": True,
-                "sample_count": len(resp.data or []),
+                "row_count": as_int(resp.count),
                 "error": None,
             }
         except Exception as exc:
-            status[table] = {"available": False, "sample_count": 0, "error": str(exc)}
-    return status
+            return {"available": False, "row_count": 0, "error": str(exc)}
+
+    # One round trip of wall time instead of one per table.
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS * 2, len(DESIGN_TABLES))) as pool:
+        return dict(zip(DESIGN_TABLES, pool.map(probe, DESIGN_TABLES)))
 
 
 def lines_operations(status: dict[str, Any], width: int) -> list[str]:
+    # Only availability and counts reach the page, so re-probes that change
+    # neither (the usual case) reuse the previously rendered lines.
+    probe_key = tuple(
+        (bool(status.get(t, {}).get("available")), status.get(t, {}).get("row_count", 0))
+        for t in DESIGN_TABLES
+    )
+    return list(_operations_lines(probe_key, width))
+
+
+@lru_cache(maxsize=8)
+def _operations_lines(probe_key: tuple[tuple[bool, int], ...], width: int) -> tuple[str, ...]:
     rows = []
-    for table in DESIGN_TABLES:
-        row = status.get(table, {})
-        available = bool(row.get("available"))
-        rows.append([table, "READY" if available else "MISSING", row.get("sample_count", 0)])
+    available_tables: set[str] = set()
+    for table, (available, row_count) in zip(DESIGN_TABLES, probe_key):
+        rows.append([table, "READY" if available else "MISSING", row_count])
+        if available:
+            available_tables.add(table)
     lines = [
         "Phase Readiness (design v2 tables)",
         "READY = table exists, MISSING = not migrated yet",
     ]
-    lines.extend(render_table_lines(["Table", "Status", "Rows(sampled)"], rows, width))
+    lines.extend(render_table_lines(["Table", "Status", "Rows"], rows, width))
 
     lines.append("")
     lines.append("Command Readiness")
-    command_rows = [
-        ["/mystats", "READY", "derived from users/messages/reactions"],
-        ["/leaderboard", "READY", "30d CP ranking"],
-        ["/leaderboard category", "READY", "category leaderboard"],
-        ["/history", "PARTIAL", "derived daily history, cp_ledger not ready"],
-        [
-            "/mytitles /settitle",
-            "READY"
-            if status.get("achievements", {}).get("available")
-            and status.get("member_achievements", {}).get("available")
-            else "PENDING",
-            "requires achievements tables",
-        ],
-        [
-            "/vote create /vote list",
-            "READY" if status.get("votes", {}).get("available") else "PENDING",
-            "requires votes tables",
-        ],
-        [
-            "/issue create /issue list",
-            "READY" if status.get("issues", {}).get("available") else "PENDING",
-            "requires issues table",
-        ],
-        [
-            "/quest create",
-            "READY" if status.get("quests", {}).get("available") else "PENDING",
-            "requires quests table",
-        ],
-        ["/dispute", "PENDING", "review/dispute schema not found in current DB"],
-    ]
-    lines.extend(render_table_lines(["Command", "Status", "Backend"], command_rows, width))
-    return lines
+    command_rows = []
+    for command, readiness, backend in COMMAND_READINESS:
+        if not isinstance(readiness, str):
+            readiness = "READY" if available_tables.issuperset(readiness) else "PENDING"
+        command_rows.append([command, readiness, backend])
+    lines.extend(
+        render_table_lines(COMMAND_HEADERS, command_rows, width, COMMAND_COL_WIDTHS)
+    )
+    return tuple(lines)
+
+
+# Core-model pages: (model, width, limit, days, focus_user) -> lines.
+# Operations renders from its own probe status instead of the model.
+PAGE_RENDERERS: dict[str, Callable[[dict[str, Any], int, int, int, str], list[str]]] = {
+    "overview": lambda model, width, limit, days, focus: lines_overview(model, days, width),
+    "mystats": lambda model, width, limit, days, focus: lines_mystats(model, focus, width),
+    "leaderboard": lambda model, width, limit, days, focus: lines_leaderboard(model, limit, width),
+    "categories": lambda model, width, limit, days, focus: lines_categories(model, limit, width),
+    "channels": lambda model, width, limit, days, focus: lines_channels(model, limit, width),
+    "behavior": lambda model, width, limit, days, focus: lines_behavior(model, width),
+    "graph": lambda model, width, limit, days, focus: lines_graph(model, limit, width),
+    "governance": lambda model, width, limit, days, focus: lines_governance(model, limit, width),
+}
+
+
+@lru_cache(maxsize=len(PAGE_ORDER))
+def page_tabs(page_idx: int) -> str:
+    return " ".join(
+        f"[{i + 1}:{PAGE_TITLES[p]}]" if i != page_idx else f"*{i + 1}:{PAGE_TITLES[p]}*"
+        for i, p in enumerate(PAGE_ORDER)
+    )
 
 
 class DashboardTUI:
@@ -1088,6 +1447,7 @@ class DashboardTUI:
         max_messages: int,
         max_reactions: int,
         max_users: int,
+        use_cache: bool = True,
     ) -> None:
         self.client = client
         self.limit = max(1, limit)
@@ -1098,36 +1458,80 @@ class DashboardTUI:
         self.max_messages = max(1000, max_messages)
         self.max_reactions = max(1000, max_reactions)
         self.max_users = max(100, max_users)
+        self.use_cache = use_cache
         self.page_idx = 0
         self.auto_refresh = True
         self.cache: dict[str, Any] = {}
         self.last_refresh_at: datetime | None = None
         self.last_error: str | None = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+        # Rendered page lines keyed by (page, width, cache version); bumped on every refresh.
+        self._render_cache: dict[tuple[str, int, int], list[str]] = {}
+        self._cache_version = 0
+        # Redraw only after input, a finished refresh, or a terminal resize.
+        self._dirty = True
+        self._last_size: tuple[int, int] | None = None
+        # Set by handle_key; the run loop refreshes once per burst of keys.
+        self._needs_refresh = False
 
     @property
     def current_page(self) -> str:
         return PAGE_ORDER[self.page_idx]
 
-    def refresh_current_page(self) -> None:
-        self.last_error = None
-        page = self.current_page
-        try:
-            if page == "operations":
-                self.cache["operations"] = fetch_operations_status(self.client)
-            else:
-                self.cache["core"] = build_core_model(
-                    self.client,
-                    self.days,
-                    self.lookback_days,
-                    self.max_messages,
-                    self.max_reactions,
-                    self.max_users,
-                )
-            self.last_refresh_at = datetime.now()
-        except Exception as exc:
-            self.last_error = str(exc)
+    def model_cache_path(self) -> Path:
+        return model_cache_path(
+            self.days,
+            self.lookback_days,
+            self.max_messages,
+            self.max_reactions,
+            self.max_users,
+        )
+
+    def refresh_current_page(self, incremental: bool = False) -> None:
+        with self._refresh_lock:
+            self.last_error = None
+            page = self.current_page
+            try:
+                if page == "operations":
+                    self.cache["operations"] = fetch_operations_status(self.client)
+                else:
+                    model = build_core_model(
+                        self.client,
+                        self.days,
+                        self.lookback_days,
+                        self.max_messages,
+                        self.max_reactions,
+                        self.max_users,
+                        prior=self.cache.get("core") if incremental else None,
+                    )
+                    self.cache["core"] = model
+                    if self.use_cache:
+                        save_cached_model(self.model_cache_path(), model)
+                self.last_refresh_at = datetime.now()
+            except Exception as exc:
+                self.last_error = str(exc)
+            self._cache_version += 1
+            self._dirty = True
+
+    def start_background_refresh(self) -> None:
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(
+            target=self.refresh_current_page, kwargs={"incremental": True}, daemon=True
+        )
+        self._refresh_thread.start()
 
     def render_page_lines(self, width: int) -> list[str]:
+        key = (self.current_page, width, self._cache_version)
+        lines = self._render_cache.get(key)
+        if lines is None:
+            lines = self._render_cache[key] = self._compute_page_lines(width)
+            while len(self._render_cache) > 2:
+                del self._render_cache[next(iter(self._render_cache))]
+        return lines
+
+    def _compute_page_lines(self, width: int) -> list[str]:
         page = self.current_page
         if page == "operations":
             status = self.cache.get("operations")
@@ -1139,23 +1543,10 @@ class DashboardTUI:
         if model is None:
             return ["Loading core model..."]
 
-        if page == "overview":
-            return lines_overview(model, self.days, width)
-        if page == "mystats":
-            return lines_mystats(model, self.focus_user, width)
-        if page == "leaderboard":
-            return lines_leaderboard(model, self.limit, width)
-        if page == "categories":
-            return lines_categories(model, self.limit, width)
-        if page == "channels":
-            return lines_channels(model, self.limit, width)
-        if page == "behavior":
-            return lines_behavior(model, width)
-        if page == "graph":
-            return lines_graph(model, self.limit, width)
-        if page == "governance":
-            return lines_governance(model, self.limit, width)
-        return ["Unknown page"]
+        renderer = PAGE_RENDERERS.get(page)
+        if renderer is None:
+            return ["Unknown page"]
+        return renderer(model, width, self.limit, self.days, self.focus_user)
 
     def draw(self, stdscr: Any) -> None:
         stdscr.erase()
@@ -1168,13 +1559,8 @@ class DashboardTUI:
         )
         stdscr.addnstr(0, 0, clip(f"{title} | {status}", width), width)
 
-        tabs = " ".join(
-            f"[{i + 1}:{PAGE_TITLES[p]}]" if i != self.page_idx else f"*{i + 1}:{PAGE_TITLES[p]}*"
-            for i, p in enumerate(PAGE_ORDER)
-        )
-        stdscr.addnstr(1, 0, clip(tabs, width), width)
-        help_line = "q:quit tab/arrow:page r:refresh a:auto +/-:limit [ ]:days u:focus auto-top"
-        stdscr.addnstr(2, 0, clip(help_line, width), width)
+        stdscr.addnstr(1, 0, clip(page_tabs(self.page_idx), width), width)
+        stdscr.addnstr(2, 0, clip(HELP_LINE, width), width)
         stdscr.hline(3, 0, "-", width)
 
         lines = self.render_page_lines(max(1, width - 1))
@@ -1195,55 +1581,82 @@ class DashboardTUI:
             return False
         if key in (9, curses.KEY_RIGHT):
             self.page_idx = (self.page_idx + 1) % len(PAGE_ORDER)
-            self.refresh_current_page()
+            self._needs_refresh = True
         elif key == curses.KEY_LEFT:
             self.page_idx = (self.page_idx - 1) % len(PAGE_ORDER)
-            self.refresh_current_page()
+            self._needs_refresh = True
         elif ord("1") <= key <= ord("9"):
             idx = key - ord("1")
             if idx < len(PAGE_ORDER):
                 self.page_idx = idx
-                self.refresh_current_page()
+                self._needs_refresh = True
         elif key in (ord("r"), ord("R")):
-            self.refresh_current_page()
+            self._needs_refresh = True
         elif key == ord("a"):
             self.auto_refresh = not self.auto_refresh
         elif key == ord("+"):
             self.limit += 5
-            self.refresh_current_page()
+            self._needs_refresh = True
         elif key == ord("-"):
             self.limit = max(5, self.limit - 5)
-            self.refresh_current_page()
+            self._needs_refresh = True
         elif key == ord("]"):
             self.days += 7
-            self.refresh_current_page()
+            self._needs_refresh = True
         elif key == ord("["):
             self.days = max(7, self.days - 7)
-            self.refresh_current_page()
+            self._needs_refresh = True
         elif key == ord("u"):
             self.focus_user = ""
-            self.refresh_current_page()
+            self._needs_refresh = True
         return True
 
     def run(self, stdscr: Any) -> None:
         curses.curs_set(0)
         stdscr.nodelay(True)
         stdscr.timeout(200)
-        self.refresh_current_page()
+        if self.use_cache:
+            # Show the last saved model right away; fresh data arrives in the background.
+            cached = load_cached_model(self.model_cache_path())
+            if cached is not None:
+                self.cache["core"] = cached
+        if "core" in self.cache:
+            self.start_background_refresh()
+        else:
+            self.refresh_current_page()
         last_tick = time.monotonic()
         running = True
 
         while running:
             now = time.monotonic()
             if self.auto_refresh and (now - last_tick) >= self.refresh_interval:
-                self.refresh_current_page()
+                self.start_background_refresh()
                 last_tick = now
 
-            self.draw(stdscr)
+            size = stdscr.getmaxyx()
+            if size != self._last_size:
+                self._last_size = size
+                self._dirty = True
+            if self._dirty:
+                self._dirty = False
+                self.draw(stdscr)
             key = stdscr.getch()
             if key != -1:
-                running = self.handle_key(key)
+                # Drain queued keys (e.g. a held Tab) without waiting, then refresh once.
+                keys = [key]
+                stdscr.timeout(0)
+                while len(keys) < 16 and (key := stdscr.getch()) != -1:
+                    keys.append(key)
+                stdscr.timeout(200)
+                for key in keys:
+                    running = self.handle_key(key)
+                    if not running:
+                        break
+                self._dirty = True
                 last_tick = now
+            if running and self._needs_refresh:
+                self._needs_refresh = False
+                self.refresh_current_page()
 
 
 def print_lines(lines: list[str]) -> None:
@@ -1261,6 +1674,7 @@ def run_non_tui(
     max_messages: int,
     max_reactions: int,
     max_users: int,
+    cache_ttl: float | None = None,
 ) -> int:
     try:
         if section == "operations":
@@ -1268,38 +1682,36 @@ def run_non_tui(
             print_lines(lines_operations(fetch_operations_status(client), 120))
             return 0
 
-        model = build_core_model(
-            client,
-            days,
-            lookback_days,
-            max_messages,
-            max_reactions,
-            max_users,
-        )
+        cache_path = model_cache_path(days, lookback_days, max_messages, max_reactions, max_users)
+        model = load_cached_model(cache_path, cache_ttl) if cache_ttl is not None else None
+        if model is None:
+            prior = load_cached_model(cache_path) if cache_ttl is not None else None
+            if prior is not None:
+                full_scan_at = prior.get("full_scan_at")
+                max_age = timedelta(seconds=(cache_ttl or 0.0) * PRIOR_MAX_TTLS)
+                if full_scan_at is None or datetime.now(timezone.utc) - full_scan_at > max_age:
+                    prior = None
+            model = build_core_model(
+                client,
+                days,
+                lookback_days,
+                max_messages,
+                max_reactions,
+                max_users,
+                prior=prior,
+            )
+            if cache_ttl is not None:
+                save_cached_model(cache_path, model)
         sections = PAGE_ORDER if section == "all" else [section]
 
         for page in sections:
             print()
             print(f"{PAGE_TITLES[page]}")
             print("=" * len(PAGE_TITLES[page]))
-            if page == "overview":
-                print_lines(lines_overview(model, days, 120))
-            elif page == "mystats":
-                print_lines(lines_mystats(model, focus_user, 120))
-            elif page == "leaderboard":
-                print_lines(lines_leaderboard(model, limit, 120))
-            elif page == "categories":
-                print_lines(lines_categories(model, limit, 120))
-            elif page == "channels":
-                print_lines(lines_channels(model, limit, 120))
-            elif page == "behavior":
-                print_lines(lines_behavior(model, 120))
-            elif page == "graph":
-                print_lines(lines_graph(model, limit, 120))
-            elif page == "governance":
-                print_lines(lines_governance(model, limit, 120))
-            elif page == "operations":
+            if page == "operations":
                 print_lines(lines_operations(fetch_operations_status(client), 120))
+            else:
+                print_lines(PAGE_RENDERERS[page](model, 120, limit, days, focus_user))
         return 0
     except Exception as exc:
         print(f"Error: failed to render dashboard: {exc}", file=sys.stderr)
@@ -1338,6 +1750,7 @@ def main() -> None:
                 args.max_messages,
                 args.max_reactions,
                 args.max_users,
+                use_cache=not args.no_cache,
             )
             curses.wrapper(app.run)
         except KeyboardInterrupt:
@@ -1359,6 +1772,7 @@ def main() -> None:
             args.max_messages,
             args.max_reactions,
             args.max_users,
+            cache_ttl=None if args.no_cache else max(0.0, args.refresh),
         )
     except KeyboardInterrupt:
         print()
@@ -8,18 +8,19 @@ Usage:
     python tools/import_history.py <json_file_path>
 
 Dependencies:
+    - httpx[http2]
+    - ijson
     - python-dotenv
-    - supabase
 """
-import json
 import asyncio
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import httpx
+import ijson
 from dotenv import load_dotenv
-from supabase import create_client, Client
 
 # プロジェクトルートの.envを読み込む
 project_root = Path(__file__).parent.parent
@@ -34,9 +35,64 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     print("Error: SUPABASE_URL and SUPABASE_KEY must be set in .env")
     sys.exit(1)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-async def import_history(file_path: str):
+# 500件ずつバッチ処理
+BATCH_SIZE = 500
+# 同時にインポートするファイル数
+MAX_CONCURRENT_FILES = 4
+# 1ファイル内で同時に送信中にしておくメッセージバッチ数
+MAX_INFLIGHT_BATCHES = 3
+
+def postgrest_client() -> httpx.AsyncClient:
+    """PostgREST を直接叩く非同期クライアント（HTTP/2 で1接続を使い回す）"""
+    assert SUPABASE_URL and SUPABASE_KEY  # 起動時にチェック済み（型の絞り込み用）
+    return httpx.AsyncClient(
+        base_url=f"{SUPABASE_URL}/rest/v1",
+        headers={"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
+        http2=True,
+        timeout=60,
+    )
+
+async def post_rows(http: httpx.AsyncClient, path: str, rows, prefer: str):
+    res = await http.post(path, json=rows, headers={"Prefer": prefer})
+    res.raise_for_status()
+
+async def post_messages(http: httpx.AsyncClient, records, label: str) -> int:
+    """メッセージバッチを送信し、成功した件数を返す"""
+    try:
+        await post_rows(
+            http,
+            "/messages?on_conflict=message_id",
+            records,
+            "resolution=ignore-duplicates,return=minimal",
+        )
+    except Exception as e:
+        print(f"Error importing messages batch: {e}")
+        return 0
+    print(label)
+    return len(records)
+
+def read_export_ids(path: Path):
+    """guild.id / channel.id だけを読み出す（どちらもファイル先頭付近にあるため全体は読まない）"""
+    ids = []
+    for prefix in ("guild.id", "channel.id"):
+        with open(path, "rb") as f:
+            ids.append(next(ijson.items(f, prefix), None))
+    return ids
+
+def iter_message_batches(path: Path, size: int):
+    """messages 配列を1件ずつストリーム解析し、size件ごとのリストで返す"""
+    with open(path, "rb") as f:
+        batch = []
+        # use_float: 数値を Decimal ではなく float で生成する（不要な Decimal 変換を省く）
+        for msg in ijson.items(f, "messages.item", use_float=True):
+            batch.append(msg)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+async def import_history(file_path: str, http: httpx.AsyncClient):
     """JSONファイルを読み込んでインポート"""
     path = Path(file_path)
     if not path.exists():
@@ -44,31 +100,29 @@ async def import_history(file_path: str):
         return
 
     print(f"Reading {file_path}...")
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    messages = data.get("messages", [])
-    guild_id = data.get("guild", {}).get("id")
-    channel_id = data.get("channel", {}).get("id")
+    # ファイル全体を json.load せず ijson でストリーム解析する（メモリ使用量がファイルサイズに依存しない）
+    guild_id, channel_id = read_export_ids(path)
 
     if not guild_id or not channel_id:
         print("Error: Invalid JSON format (missing guild or channel info)")
         return
 
-    print(f"Found {len(messages)} messages. Starting import...")
-    
+    print("Starting import...")
+
     # ユーザーごとのスコア集計用
     user_scores = {}
     users_to_upsert = {}
+    # 登録済み（送信キューに入れた）ユーザー。同じユーザーをバッチごとに再送しない
+    seen_user_ids = set()
 
     imported_count = 0
     skipped_count = 0
+    processed_count = 0
+    pending = []  # 送信中のメッセージバッチ
 
-    # 500件ずつバッチ処理
-    BATCH_SIZE = 500
-    
-    for i in range(0, len(messages), BATCH_SIZE):
-        batch = messages[i:i + BATCH_SIZE]
+    for batch in iter_message_batches(path, BATCH_SIZE):
+        i = processed_count
+        processed_count += len(batch)
         message_records = []
         
         for msg in batch:
@@ -80,8 +134,9 @@ async def import_history(file_path: str):
                 skipped_count += 1
                 continue
 
-            # ユーザー情報を記録
-            if user_id not in users_to_upsert:
+            # ユーザー情報を記録（ファイル内で初めて出てきたときだけ）
+            if user_id not in seen_user_ids:
+                seen_user_ids.add(user_id)
                 users_to_upsert[user_id] = {
                     "user_id": int(user_id),
                     "username": username,
@@ -112,52 +167,46 @@ async def import_history(file_path: str):
             current = user_scores.get(user_id, 0.0)
             user_scores[user_id] = current + float(BASE_SCORE)
 
-        # ユーザー情報のUpsert (バッチごとに行うか、最後に行うか。今回はバッチごとに確実に)
+        # ユーザー情報のUpsert (このバッチで新しく出てきたユーザーのみ)
         if users_to_upsert:
             try:
                 # ユーザー登録（既存なら無視、ただし名前更新した方がいいかもだが、今回はシンプルに）
-                supabase.table("users").upsert(
-                    list(users_to_upsert.values()), 
-                    on_conflict="user_id"
-                ).execute()
+                # メッセージの外部キーが参照するため、同じバッチのメッセージより先に完了させる
+                await post_rows(
+                    http,
+                    "/users?on_conflict=user_id",
+                    list(users_to_upsert.values()),
+                    "resolution=merge-duplicates,return=minimal",
+                )
                 users_to_upsert.clear() # 次のバッチのためにクリア
             except Exception as e:
                 print(f"Error upserting users: {e}")
 
-        # メッセージの一括挿入
+        # メッセージの一括挿入（最大 MAX_INFLIGHT_BATCHES 件を並行して送信）
         if message_records:
-            try:
-                supabase.table("messages").upsert(
-                    message_records,
-                    on_conflict="message_id",
-                    ignore_duplicates=True 
-                ).execute()
-                imported_count += len(message_records)
-                print(f"Imported batch {i} - {i + len(batch)} / {len(messages)}")
-            except Exception as e:
-                print(f"Error importing messages batch: {e}")
+            pending.append(asyncio.create_task(
+                post_messages(http, message_records, f"[{path.name}] Imported batch {i} - {processed_count}")
+            ))
+            if len(pending) >= MAX_INFLIGHT_BATCHES:
+                imported_count += await pending.pop(0)
+
+    imported_count += sum(await asyncio.gather(*pending))
 
     # 最終的なスコア更新
+    # increment_user_scores RPC (migrations/008_increment_user_scores.sql) で
+    # 全ユーザーの累計・週間スコアへサーバー側で一括加算する（ユーザーごとの SELECT + UPDATE を省略）
     print("Updating user scores...")
-    for uid, score in user_scores.items():
+    if user_scores:
+        deltas = [{"user_id": int(uid), "delta": score} for uid, score in user_scores.items()]
         try:
-            # 現在のスコアを取得
-            res = supabase.table("users").select("current_score").eq("user_id", uid).execute()
-            if res.data:
-                current = float(res.data[0]["current_score"] or 0)
-                # total_score カラムは存在しない可能性があるため更新しない (current_scoreのみ)
-                
-                supabase.table("users").update({
-                    "current_score": current + score,
-                    "weekly_score": float(res.data[0].get("weekly_score", 0)) + score # 週間スコアも加算しておく
-                }).eq("user_id", uid).execute()
-                
+            res = await http.post("/rpc/increment_user_scores", json={"deltas": deltas})
+            res.raise_for_status()
         except Exception as e:
-            print(f"Error updating score for user {uid}: {e}")
+            print(f"Error updating user scores: {e}")
 
     print("===========================================")
-    print(f"Import Finished!")
-    print(f"Total Messages Processed: {len(messages)}")
+    print(f"Import Finished! ({path.name})")
+    print(f"Total Messages Processed: {processed_count}")
     print(f"Imported: {imported_count}")
     print(f"Skipped (Bots/Error): {skipped_count}")
     print("===========================================")
@@ -169,9 +218,20 @@ if __name__ == "__main__":
     
     # 全ての引数を処理
     files = sys.argv[1:]
+
+    if ijson.backend != "yajl2_c":
+        # C 拡張版 (yajl2_c) が使えない環境では純 Python パーサーになり、大きなファイルで遅くなる
+        print(f"Warning: ijson C backend unavailable (using {ijson.backend}); parsing will be slow")
     
     async def run_all():
-        for f in files:
-            await import_history(f)
+        # ファイル単位で並列実行（同時実行数はセマフォで制限）
+        sem = asyncio.Semaphore(MAX_CONCURRENT_FILES)
+
+        async with postgrest_client() as http:
+            async def _one(f):
+                async with sem:
+                    await import_history(f, http)
+
+            await asyncio.gather(*(_one(f) for f in files))
             
     asyncio.run(run_all())
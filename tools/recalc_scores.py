@@ -2,8 +2,9 @@
 import asyncio
 import os
 from datetime import datetime, timedelta, timezone
+from typing import Any
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client, Client
 
 # 環境変数をロード
 load_dotenv()
@@ -15,114 +16,111 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     print("Error: SUPABASE_URL or SUPABASE_KEY not not found in .env")
     exit(1)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# PostgREST の max-rows（既定1000）を超えても全ユーザーを取得できるようにページングする
+PAGE_SIZE = 1000
 
-async def recalc_scores():
-    print("Starting score recalculation...")
-    
-    # 全ユーザーを取得
-    # 一度に取得する数が多すぎる場合はページネーションが必要だが、
-    # 今回は簡易的にlimitを大きく設定（例: 1000人）
-    print("Fetching users...")
-    users_res = supabase.table("users").select("user_id, username").limit(1000).execute()
-    users = users_res.data
-    
-    if not users:
-        print("No users found.")
-        return
+def postgrest_client() -> httpx.AsyncClient:
+    """PostgREST を直接叩く非同期クライアント（HTTP/2 で1接続を使い回す）"""
+    assert SUPABASE_URL and SUPABASE_KEY  # 起動時にチェック済み（型の絞り込み用）
+    return httpx.AsyncClient(
+        base_url=f"{SUPABASE_URL}/rest/v1",
+        headers={"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
+        http2=True,
+        timeout=60,
+    )
 
-    print(f"Found {len(users)} users. Calculating scores...")
+async def recalc_scores(http: httpx.AsyncClient):
+    print("Starting score recalculation...")
 
     now = datetime.now(timezone.utc)
     week_ago = now - timedelta(days=7)
     week_ago_iso = week_ago.isoformat()
 
-    updated_count = 0
+    # total_score が 0 のまま保存されたメッセージを DB 上で一括修復する
+    # (migrations/009_repair_zero_scores.sql)。修復済みなので以降の集計は total_score をそのまま使える。
+    print("Repairing zero scores...")
+    try:
+        res = await http.post("/rpc/repair_zero_scores", json={})
+        if res.status_code == 404:
+            # 009 未適用（関数が存在しない）場合は 007 版の recalc_user_scores が集計時に補完する
+            print("Warning: repair_zero_scores not found; relying on recalc_user_scores to fill zero scores.")
+        else:
+            res.raise_for_status()
+            print(f"Repaired {res.json() or 0} messages.")
+    except Exception as e:
+        # 009 版の recalc_user_scores は total_score をそのまま合計するため、
+        # 修復に失敗したまま続けると過小なスコアで全ユーザーを上書きしてしまう
+        print(f"Error: repair_zero_scores failed, aborting without updating scores: {e}")
+        return
+
+    # 集計はサーバー側 RPC (migrations/007, 009) で一括実行する。
+    # メッセージの生データは転送せず、ユーザーごとの合計のみを受け取る。
+    # 応答は max-rows で切られるため limit/offset でページングする。各ページは別リクエストで
+    # 集計をやり直し、それぞれ別スナップショットになる。一意な user_id で並べてページ境界を固定するが、
+    # 実行中の書き込みは後のページにだけ反映されうる（次回の再計算で揃う）。
+    print("Aggregating scores on the server...")
+    rows: list[dict[str, Any]] = []
+    offset = 0
+    while True:
+        res = await http.post(
+            "/rpc/recalc_user_scores",
+            params={"order": "user_id", "limit": PAGE_SIZE, "offset": offset},
+            json={"week_ago": week_ago_iso},
+        )
+        res.raise_for_status()
+        batch = res.json() or []
+        rows.extend(batch)
+        if len(batch) < PAGE_SIZE:
+            break
+        offset += len(batch)
 
-    for user in users:
-        user_id = user["user_id"]
-        username = user.get("username", "Unknown")
-        
-        try:
-            # そのユーザーの全メッセージを取得
-            # 統計情報のみ必要なため、メッセージ内容自体は不要だが、
-            # total_scoreのカラムを集計する必要がある。
-            # Supabase(PostgREST)では集計関数を直接叩くのが少し面倒なため、
-            # 生データを取得してPython側で計算する（データ量が多いと遅くなるため注意）
-            # 最適化: .dataset() 等を使うか、RPCを作るのが本来は良い。
-            
-            # 集計用変数
-            current_score = 0.0
-            weekly_score = 0.0
-            
-            # メッセージをページネーションして全件取得
-            limit = 1000
-            offset = 0
-            has_more = True
-            
-            while has_more:
-                print(f"  Fetching messages offset={offset}...")
-                res = supabase.table("messages").select("message_id, base_score, nlp_score_multiplier, total_score, created_at").eq("user_id", user_id).range(offset, offset + limit - 1).execute()
-                batch = res.data
-                
-                if not batch:
-                    has_more = False
-                    break
-                    
-                if len(batch) < limit:
-                    has_more = False
-                
-                offset += len(batch)
-
-                for m in batch:
-                    score = float(m.get("total_score", 0))
-                    
-                    # スコアが0の場合、自動修復を試みる
-                    # (以前のインポートでtotal_scoreが欠損している可能性があるため)
-                    if score == 0:
-                        base = float(m.get("base_score", 0))
-                        nlp = float(m.get("nlp_score_multiplier", 1.0))
-                        calc_score = base * nlp
-                        if calc_score > 0:
-                            # print(f"    Repairing score for msg {m['message_id']}: 0 -> {calc_score}")
-                            score = calc_score
-                            # DB書き戻しは重くなるので今回は省略し、集計値のみ正す
-                            # (次回インポート等で直ることを期待、あるいは別途修正スクリプト)
-                            
-                    current_score += score
-                    
-                    # created_at の判定
-                    created_at_str = m.get("created_at")
-                    if created_at_str:
-                        try:
-                            msg_time = datetime.fromisoformat(created_at_str)
-                            if msg_time.tzinfo is not None:
-                                msg_time_utc = msg_time.astimezone(timezone.utc)
-                            else:
-                                msg_time_utc = msg_time.replace(tzinfo=timezone.utc)
-                                
-                            if msg_time_utc >= week_ago:
-                                weekly_score += score
-                        except ValueError:
-                            continue
-            
-            print(f"User: {username} ({user_id}) -> Total: {current_score:.1f}, Weekly: {weekly_score:.1f}")
-
-            # Usersテーブルを更新
-            supabase.table("users").update({
-                "current_score": current_score,
-                "weekly_score": weekly_score,
-                "updated_at": now.isoformat()
-            }).eq("user_id", user_id).execute()
-            
-            updated_count += 1
-
-        except Exception as e:
-            print(f"Error processing user {user_id}: {e}")
+    if not rows:
+        print("No users found.")
+        return
+
+    print(f"Found {len(rows)} users. Updating scores...")
+
+    updated_at = now.isoformat()
+    updates = []
+    seen_user_ids = set()
+    for row in rows:
+        user_id = row["user_id"]
+        # ページ間で行がずれると同じユーザーが二度返ることがある（1回の upsert に重複キーは渡せない）
+        if user_id in seen_user_ids:
+            continue
+        seen_user_ids.add(user_id)
+        username = row.get("username") or "Unknown"
+        current_score = float(row.get("total") or 0)
+        weekly_score = float(row.get("weekly") or 0)
+        print(f"User: {username} ({user_id}) -> Total: {current_score:.1f}, Weekly: {weekly_score:.1f}")
+        updates.append({
+            "user_id": user_id,
+            "username": username,  # users.username は NOT NULL のため upsert に含める
+            "current_score": current_score,
+            "weekly_score": weekly_score,
+            "updated_at": updated_at
+        })
+
+    # Usersテーブルを一括更新（ユーザーごとの update().eq() を1回の upsert に置き換え）
+    updated_count = 0
+    try:
+        res = await http.post(
+            "/users?on_conflict=user_id",
+            json=updates,
+            headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+        )
+        res.raise_for_status()
+        updated_count = len(updates)
+    except Exception as e:
+        print(f"Error updating users: {e}")
 
     print("===========================================")
     print(f"Recalculation Finished! Updated {updated_count} users.")
     print("===========================================")
 
+async def main():
+    async with postgrest_client() as http:
+        await recalc_scores(http)
+
 if __name__ == "__main__":
-    asyncio.run(recalc_scores())
+    asyncio.run(main())